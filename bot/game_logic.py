@@ -1,7 +1,93 @@
-from typing import List, Dict, Optional, Tuple
-from collections import defaultdict
+from typing import List, Dict, Optional, Set, Tuple
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
 import random
 from .utils import sort_cards, validate_card, calculate_card_value
+from .constants import SUITS, RANKS
+
+# Rank -> position in RANKS, so hot paths avoid list.index scans
+RANK_IDX = {rank: idx for idx, rank in enumerate(RANKS)}
+
+# Card -> (rank index, suit) for every card in the 52-card universe
+CARD_INFO = {
+    f"{rank}{suit}": (RANK_IDX[rank], suit)
+    for rank in RANKS
+    for suit in SUITS
+}
+
+def _neighbor(rank_idx: int, suit: str) -> Optional[str]:
+    """Return the card at rank_idx in suit, or None when off the rank list."""
+    if 0 <= rank_idx < len(RANKS):
+        return f"{RANKS[rank_idx]}{suit}"
+    return None
+
+# Card -> same-suit neighbours (two below, one below, one above, two above)
+NEIGHBORS = {
+    card: tuple(_neighbor(rank_idx + offset, suit) for offset in (-2, -1, 1, 2))
+    for card, (rank_idx, suit) in CARD_INFO.items()
+}
+
+# Cards as bit positions in a 52-bit hand mask. The layout is suit-major
+# (suit_idx * 13 + rank_idx) so each suit occupies a contiguous 13-bit
+# field whose bit order matches rank order.
+SUIT_IDX = {suit: idx for idx, suit in enumerate(SUITS)}
+SUIT_BITS = (1 << len(RANKS)) - 1
+ALL_CARDS = [f"{rank}{suit}" for suit in SUITS for rank in RANKS]
+CARD_CODE = {card: code for code, card in enumerate(ALL_CARDS)}
+
+# Card -> mask bits of its adjacent same-suit cards (one rank below and above)
+ADJACENT_BITS = {
+    card: sum(1 << CARD_CODE[n] for n in NEIGHBORS[card][1:3] if n)
+    for card in ALL_CARDS
+}
+
+def hand_to_mask(hand: List[str]) -> int:
+    """Pack a hand into a 52-bit integer, one bit per distinct card."""
+    mask = 0
+    for card in hand:
+        mask |= 1 << CARD_CODE[card]
+    return mask
+
+def _count_runs(suit_bits: int) -> int:
+    """Count three-card windows of consecutive ranks in a 13-bit suit field."""
+    return (suit_bits & (suit_bits >> 1) & (suit_bits >> 2)).bit_count()
+
+# Bits where a three-card run may start without crossing into the next suit
+RUN_STARTS = sum(
+    (SUIT_BITS >> 2) << (suit_idx * len(RANKS)) for suit_idx in range(len(SUITS))
+)
+
+def _run_cards_mask(hand_mask: int) -> int:
+    """Return the mask bits of every card that sits in a run of 3+ ranks."""
+    runs = hand_mask & (hand_mask >> 1) & (hand_mask >> 2) & RUN_STARTS
+    return runs | (runs << 1) | (runs << 2)
+
+def _rank_counts(hand: List[str]) -> List[int]:
+    """Count cards per rank, indexed by rank; duplicate cards count twice."""
+    rank_counts = [0] * len(RANKS)
+    for card in hand:
+        rank_counts[CARD_INFO[card][0]] += 1
+    return rank_counts
+
+@dataclass
+class _EvalContext:
+    """Per-turn view of a hand, built once and shared by every helper."""
+    hand: List[str]
+    joker: str
+    hand_set: Set[str]
+    hand_mask: int
+    rank_counts: List[int]
+    
+    @classmethod
+    def build(cls, hand: List[str], joker: str) -> "_EvalContext":
+        return cls(
+            hand=hand,
+            joker=joker,
+            hand_set=set(hand),
+            hand_mask=hand_to_mask(hand),
+            rank_counts=_rank_counts(hand),
+        )
 
 class RummyAI:
     def __init__(self):
@@ -13,6 +99,19 @@ class RummyAI:
             'sequences_preferred': False,
             'sets_preferred': False,
         }
+        # Rank/suit tallies of every open pick, kept in step with open_picks
+        self._opp_rank_count = Counter()
+        self._opp_suit_count = Counter()
+        # Every distinct card the opponent has picked, as a hand mask
+        self.opp_pick_mask = 0
+        # History already folded in, and running sequence/set clue totals
+        self._last_picks_len = 0
+        self._last_discards_len = 0
+        self._seq_clues = 0
+        self._set_clues = 0
+        # Last suggest_turn input fingerprint and result, for retried turns
+        self._turn_key = None
+        self._turn_result = None
     
     def evaluate_hand_strength(self, hand: List[str], joker: str) -> float:
         """
@@ -22,90 +121,87 @@ class RummyAI:
         if not hand or not joker:
             return 0.0
         
-        # Count pure sequences (without joker)
-        pure_seq_count = self._count_pure_sequences(hand)
-        
-        # Count potential sequences (with or without joker)
-        potential_seq_count = self._count_potential_sequences(hand, joker)
-        
-        # Count sets
-        set_count = self._count_sets(hand, joker)
-        
-        # Calculate score (weights can be adjusted)
-        score = (pure_seq_count * 0.4) + (potential_seq_count * 0.3) + (set_count * 0.3)
-        return min(score, 1.0)
-    
-    def _count_pure_sequences(self, hand: List[str]) -> int:
-        """Count pure sequences (without jokers)."""
-        # Group cards by suit
-        suits = defaultdict(list)
-        for card in hand:
-            suits[card[-1]].append(card)
-        
-        # Check for sequences in each suit
-        seq_count = 0
-        for suit_cards in suits.values():
-            sorted_cards = sorted(suit_cards, key=lambda c: RANKS.index(c[:-1]))
-            seq_count += self._find_sequences_in_sorted_list(sorted_cards)
-        
-        return seq_count
+        # The score only depends on the multiset of cards, so a sorted tuple
+        # is a canonical cache key that still keeps duplicate cards
+        return _cached_eval(tuple(sorted(hand)), joker)
     
-    def _count_potential_sequences(self, hand: List[str], joker: str) -> int:
-        """Count potential sequences (can use joker)."""
-        # Similar to pure sequences but can include joker
-        suits = defaultdict(list)
-        for card in hand:
-            suits[card[-1]].append(card)
-        
-        seq_count = 0
-        for suit_cards in suits.values():
-            sorted_cards = sorted(suit_cards, key=lambda c: RANKS.index(c[:-1]))
-            seq_count += self._find_sequences_in_sorted_list(sorted_cards)
+    @staticmethod
+    def _seq_analysis(hand_mask: int) -> Tuple[int, float]:
+        """
+        Count pure and potential sequences in a single pass over the suits.
+        Returns (pure_count, potential_count).
+        """
+        pure_count = 0
+        potential_count = 0
+        for suit_idx in range(len(SUITS)):
+            suit_bits = (hand_mask >> (suit_idx * len(RANKS))) & SUIT_BITS
+            runs = _count_runs(suit_bits)
+            pure_count += runs
+            potential_count += runs
             
-            # Check if adding joker could complete sequences
-            # (Implementation simplified for example)
-            if len(sorted_cards) >= 2:
-                seq_count += 0.5  # Potential to complete with joker
+            # Two or more cards of a suit could be completed with the joker
+            if suit_bits.bit_count() >= 2:
+                potential_count += 0.5  # Potential to complete with joker
         
-        return seq_count
+        return pure_count, potential_count
     
-    def _count_sets(self, hand: List[str], joker: str) -> int:
+    @staticmethod
+    def _count_pure_sequences(hand_mask: int) -> int:
+        """Count pure sequences (without jokers) in a hand mask."""
+        return RummyAI._seq_analysis(hand_mask)[0]
+    
+    @staticmethod
+    def _count_potential_sequences(hand_mask: int, joker: str) -> float:
+        """Count potential sequences (can use joker) in a hand mask."""
+        return RummyAI._seq_analysis(hand_mask)[1]
+    
+    @staticmethod
+    def _count_sets(hand: List[str], joker: str) -> int:
         """Count sets of same rank."""
-        rank_counts = defaultdict(int)
-        for card in hand:
-            rank = card[:-1]
-            rank_counts[rank] += 1
-        
         # Count sets (3 or 4 of same rank)
-        set_count = sum(1 for count in rank_counts.values() if count >= 2)  # At least a pair
+        set_count = sum(1 for count in _rank_counts(hand) if count >= 2)  # At least a pair
         return set_count
     
-    def _find_sequences_in_sorted_list(self, cards: List[str]) -> int:
-        """Helper to find sequences in a sorted list of cards of the same suit."""
-        if len(cards) < 3:
-            return 0
-        
-        sequences = 0
-        current_seq = 1
-        
-        for i in range(1, len(cards)):
-            prev_rank = RANKS.index(cards[i-1][:-1])
-            curr_rank = RANKS.index(cards[i][:-1])
-            
-            if curr_rank == prev_rank + 1:
-                current_seq += 1
-                if current_seq >= 3:
-                    sequences += 1
-            else:
-                current_seq = 1
-        
-        return sequences
-    
     def suggest_initial_action(self, hand: List[str], joker: str) -> str:
         """Suggest whether to Play or Drop based on hand strength."""
         score = self.evaluate_hand_strength(hand, joker)
         return "Play" if score >= 0.5 else "Drop"
     
+    def suggest_turn(
+        self,
+        hand: List[str],
+        joker: str,
+        open_card: Optional[str],
+        discard_pile: List[str],
+        opponent_picks: List[str],
+        opponent_discards: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Suggest a whole turn at once, sharing the hand analysis between steps.
+        Returns a dict with "pick_source", "trap_card" and "discard" keys, the
+        same as calling suggest_pick_source, suggest_trap_card and
+        suggest_discard in that order.
+        """
+        # A retried turn (same inputs) reuses the last answer; this also keeps
+        # trap_history from counting the same trap twice. The opponent
+        # histories only ever grow, so their lengths identify them, and the
+        # discard pile does not affect the result
+        key = (
+            tuple(hand), joker, open_card,
+            len(opponent_picks), len(opponent_discards),
+        )
+        if key == self._turn_key:
+            return dict(self._turn_result)
+        
+        ctx = _EvalContext.build(hand, joker)
+        result = {
+            'pick_source': self._pick_source(ctx, open_card, opponent_picks, opponent_discards),
+            'trap_card': self._trap_card(ctx),
+            'discard': self._discard(ctx, opponent_picks),
+        }
+        self._turn_key, self._turn_result = key, result
+        return dict(result)
+    
     def suggest_pick_source(
         self,
         hand: List[str],
@@ -119,6 +215,17 @@ class RummyAI:
         Suggest whether to pick from open or closed deck.
         Returns "Open Deck" or "Closed Deck".
         """
+        ctx = _EvalContext.build(hand, joker)
+        return self._pick_source(ctx, open_card, opponent_picks, opponent_discards)
+    
+    def _pick_source(
+        self,
+        ctx: _EvalContext,
+        open_card: Optional[str],
+        opponent_picks: List[str],
+        opponent_discards: List[str]
+    ) -> str:
+        """Pick-source decision for a prebuilt evaluation context."""
         if not open_card:
             return "Closed Deck"
         
@@ -126,7 +233,7 @@ class RummyAI:
         self._update_opponent_behavior(opponent_picks, opponent_discards)
         
         # Check if open card completes a sequence or set
-        if self._does_card_complete_group(hand, open_card, joker):
+        if self._does_card_complete_group(open_card, ctx):
             return "Open Deck"
         
         # Check if opponent is likely not interested in this suit/rank
@@ -149,73 +256,100 @@ class RummyAI:
         Suggest which card to discard.
         Returns the card to discard.
         """
+        return self._discard(_EvalContext.build(hand, joker), opponent_picks)
+    
+    def _discard(self, ctx: _EvalContext, opponent_picks: List[str]) -> str:
+        """Discard decision for a prebuilt evaluation context."""
         # First, identify complete groups that shouldn't be broken
-        protected_cards = self._identify_protected_cards(hand, joker)
+        protected_cards = self._identify_protected_cards(ctx)
+        
+        opp_rank_hist = Counter(c[:-1] for c in opponent_picks)
+        opp_suit_hist = Counter(c[-1] for c in opponent_picks)
+        n_picks = len(opponent_picks)
         
-        # Then identify cards that are least useful and not protected
-        card_scores = []
-        for card in hand:
+        # Then identify cards that are least useful and not protected;
+        # the card with the lowest score is the best to discard
+        best_card, best_score = None, float('inf')
+        for card in ctx.hand:
             if card in protected_cards:
-                card_scores.append((card, float('inf')))  # Don't discard protected cards
+                score = float('inf')  # Don't discard protected cards
             else:
-                usefulness = self._calculate_card_usefulness(hand, card, joker)
-                danger = self._calculate_discard_danger(card, opponent_picks, opponent_discards)
+                usefulness = self._calculate_card_usefulness(card, ctx)
+                danger = self._calculate_discard_danger(card, opp_rank_hist, opp_suit_hist, n_picks)
                 score = usefulness - danger
-                card_scores.append((card, score))
+            
+            # First card seen wins ties, matching the old stable sort
+            if best_card is None or score < best_score:
+                best_card, best_score = card, score
         
-        # The card with the lowest score is the best to discard
-        card_scores.sort(key=lambda x: x[1])
-        return card_scores[0][0]
+        return best_card
     
-    def _identify_protected_cards(self, hand: List[str], joker: str) -> List[str]:
+    def _identify_protected_cards(self, ctx: _EvalContext) -> Set[str]:
         """Identify cards that are part of complete sequences or sets."""
-        protected = set()
+        # Sequences come straight from the suit fields of the hand mask
+        run_cards = _run_cards_mask(ctx.hand_mask)
         
-        # Check for sequences
-        suits = defaultdict(list)
-        for card in hand:
-            suits[card[-1]].append(card)
-        
-        for suit_cards in suits.values():
-            sorted_cards = sorted(suit_cards, key=lambda c: RANKS.index(c[:-1]))
-            sequences = self._find_complete_sequences(sorted_cards)
-            for seq in sequences:
-                protected.update(seq)
-        
-        # Check for sets
-        rank_counts = defaultdict(list)
-        for card in hand:
-            rank_counts[card[:-1]].append(card)
-        
-        for cards in rank_counts.values():
-            if len(cards) >= 3:  # Complete set
-                protected.update(cards)
+        protected = set()
+        for card in ctx.hand:
+            if (run_cards >> CARD_CODE[card]) & 1:
+                protected.add(card)
+            elif ctx.rank_counts[CARD_INFO[card][0]] >= 3:  # Complete set
+                protected.add(card)
         
-        return list(protected)
+        return protected
     
-    def _calculate_card_usefulness(self, hand: List[str], card: str, joker: str) -> float:
+    def _calculate_card_usefulness(self, card: str, ctx: _EvalContext) -> float:
         """Calculate how useful a card is in the current hand."""
         # Check if card is part of a sequence
-        seq_value = self._sequence_contribution(hand, card, joker)
+        seq_value = self._sequence_contribution(card, ctx.hand_mask)
         
         # Check if card is part of a set
-        set_value = self._set_contribution(hand, card)
+        set_value = self._set_contribution(card, ctx.rank_counts)
         
         # Check if card is joker
-        joker_value = 1.0 if card == joker else 0.0
+        joker_value = 1.0 if card == ctx.joker else 0.0
         
         return max(seq_value, set_value, joker_value)
     
-    def _calculate_discard_danger(self, card: str, opponent_picks: List[str], opponent_discards: List[str]) -> float:
+    def _sequence_contribution(self, card: str, hand_mask: int) -> float:
+        """Score how close this card is to a sequence in its suit."""
+        rank_idx, suit = CARD_INFO[card]
+        suit_bits = (hand_mask >> (SUIT_IDX[suit] * len(RANKS))) & SUIT_BITS
+        runs = suit_bits & (suit_bits >> 1) & (suit_bits >> 2)
+        
+        # A run starting at rank_idx-2, rank_idx-1 or rank_idx covers this card
+        if runs & ((0b111 << rank_idx) >> 2):
+            return 1.0
+        # Adjacent rank in the same suit
+        if suit_bits & ((0b101 << rank_idx) >> 1):
+            return 0.5
+        # One-gap neighbour in the same suit
+        if suit_bits & ((0b10001 << rank_idx) >> 2):
+            return 0.25
+        return 0.0
+    
+    def _set_contribution(self, card: str, rank_counts: List[int]) -> float:
+        """Score how close this card is to a set of its rank."""
+        others = rank_counts[CARD_INFO[card][0]] - 1
+        if others >= 2:
+            return 1.0
+        if others == 1:
+            return 0.5
+        return 0.0
+    
+    def _calculate_discard_danger(
+        self,
+        card: str,
+        opp_rank_hist: Counter,
+        opp_suit_hist: Counter,
+        n_picks: int
+    ) -> float:
         """Calculate how dangerous it is to discard this card."""
         # Check if opponent has been picking similar cards
-        rank = card[:-1]
-        suit = card[-1]
-        
-        rank_danger = sum(1 for c in opponent_picks if c[:-1] == rank) / (len(opponent_picks) + 1)
-        suit_danger = sum(1 for c in opponent_picks if c[-1] == suit) / (len(opponent_picks) + 1)
+        rank_idx, suit = CARD_INFO[card]
+        rank = RANKS[rank_idx]
         
-        return max(rank_danger, suit_danger)
+        return max(opp_rank_hist[rank], opp_suit_hist[suit]) / (n_picks + 1)
     
     def suggest_trap_card(
         self,
@@ -228,13 +362,17 @@ class RummyAI:
         Suggest a card to discard as a trap, if appropriate.
         Returns None if no good trap opportunity.
         """
+        return self._trap_card(_EvalContext.build(hand, joker))
+    
+    def _trap_card(self, ctx: _EvalContext) -> Optional[str]:
+        """Trap-card decision for a prebuilt evaluation context."""
         # Identify cards that appear useful but aren't
-        for card in hand:
-            if card == joker:
+        for card in ctx.hand:
+            if card == ctx.joker:
                 continue
                 
             # Check if this card appears to complete a sequence but actually doesn't
-            if self._is_false_sequence_card(hand, card, joker):
+            if self._is_false_sequence_card(card, ctx):
                 # Check if opponent might want it
                 if self._is_card_likely_useful_to_opponent(card):
                     self.trap_history[card] += 1
@@ -242,103 +380,119 @@ class RummyAI:
         
         return None
     
-    def _is_false_sequence_card(self, hand: List[str], card: str, joker: str) -> bool:
+    def _is_false_sequence_card(self, card: str, ctx: _EvalContext) -> bool:
         """Check if this card appears to complete a sequence but doesn't."""
-        suit = card[-1]
-        rank = card[:-1]
-        rank_idx = RANKS.index(rank)
+        hand_set = ctx.hand_set
         
         # Check if it appears to complete a sequence from either side
-        lower_neighbor = f"{RANKS[rank_idx-1]}{suit}" if rank_idx > 0 else None
-        upper_neighbor = f"{RANKS[rank_idx+1]}{suit}" if rank_idx < len(RANKS)-1 else None
+        lower_two, lower_neighbor, upper_neighbor, upper_two = NEIGHBORS[card]
         
         # Case 1: We have X and Z, this is Y - looks like it completes X Y Z
-        case1 = (lower_neighbor and upper_neighbor and 
-                 lower_neighbor in hand and upper_neighbor in hand)
+        case1 = lower_neighbor in hand_set and upper_neighbor in hand_set
         
         # Case 2: We have X and Y, this is Z - looks like it completes X Y Z
-        case2 = (lower_neighbor and rank_idx >= 2 and 
-                 lower_neighbor in hand and f"{RANKS[rank_idx-2]}{suit}" in hand)
+        case2 = lower_neighbor in hand_set and lower_two in hand_set
         
         # Case 3: We have Y and Z, this is X - looks like it completes X Y Z
-        case3 = (upper_neighbor and rank_idx < len(RANKS)-2 and 
-                 upper_neighbor in hand and f"{RANKS[rank_idx+2]}{suit}" in hand)
+        case3 = upper_neighbor in hand_set and upper_two in hand_set
         
         return case1 or case2 or case3
     
     def _is_card_likely_useful_to_opponent(self, card: str) -> bool:
         """Check if the opponent is likely to want this card."""
-        rank = card[:-1]
-        suit = card[-1]
+        rank_idx, suit = CARD_INFO[card]
+        rank = RANKS[rank_idx]
         
         # Check if opponent has been collecting this rank or suit
-        rank_picks = sum(1 for c in self.opponent_behavior['open_picks'] if c[:-1] == rank)
-        suit_picks = sum(1 for c in self.opponent_behavior['open_picks'] if c[-1] == suit)
-        
-        return rank_picks > 1 or suit_picks > 2
+        return self._opp_rank_count[rank] > 1 or self._opp_suit_count[suit] > 2
     
     def _update_opponent_behavior(self, opponent_picks: List[str], opponent_discards: List[str]):
-        """Update opponent behavior tracking based on their actions."""
-        for card in opponent_picks:
-            self.opponent_behavior['open_picks'][card] += 1
+        """
+        Update opponent behavior tracking based on their actions.
+        Callers pass the full history each turn; only the entries added
+        since the previous call are processed.
+        """
+        for card in opponent_picks[self._last_picks_len:]:
+            self._record_pick(card)
+        self._last_picks_len = len(opponent_picks)
         
-        for card in opponent_discards:
+        for card in opponent_discards[self._last_discards_len:]:
             self.opponent_behavior['discards'][card] += 1
+        self._last_discards_len = len(opponent_discards)
         
         # Analyze if opponent prefers sequences or sets
-        seq_clues = sum(1 for card in opponent_picks if self._is_sequence_related(card, opponent_picks))
-        set_clues = sum(1 for card in opponent_picks if self._is_set_related(card, opponent_picks))
-        
-        if seq_clues > set_clues + 2:
+        if self._seq_clues > self._set_clues + 2:
             self.opponent_behavior['sequences_preferred'] = True
-        elif set_clues > seq_clues + 2:
+        elif self._set_clues > self._seq_clues + 2:
             self.opponent_behavior['sets_preferred'] = True
     
-    def _is_sequence_related(self, card: str, opponent_picks: List[str]) -> bool:
-        """Check if this pick suggests sequence building."""
-        suit = card[-1]
+    def _record_pick(self, card: str):
+        """Fold one opponent pick into the running counts and clue totals."""
+        open_picks = self.opponent_behavior['open_picks']
+        
+        # Sequence clues: a pick counts once an adjacent card has been picked
+        bit = 1 << CARD_CODE[card]
+        if not self.opp_pick_mask & bit:
+            # A new card can turn earlier picks of its neighbours into clues
+            for neighbor in NEIGHBORS[card][1:3]:
+                if neighbor in open_picks and not self._is_sequence_related(neighbor, self.opp_pick_mask):
+                    self._seq_clues += open_picks[neighbor]
+            self.opp_pick_mask |= bit
+        if self._is_sequence_related(card, self.opp_pick_mask):
+            self._seq_clues += 1
+        
+        # Set clues: every pick of a rank counts once the rank is picked twice
         rank = card[:-1]
-        rank_idx = RANKS.index(rank)
-        
-        # Check if neighbor cards were also picked
-        lower_neighbor = f"{RANKS[rank_idx-1]}{suit}" if rank_idx > 0 else None
-        upper_neighbor = f"{RANKS[rank_idx+1]}{suit}" if rank_idx < len(RANKS)-1 else None
-        
-        return (lower_neighbor and lower_neighbor in opponent_picks) or \
-               (upper_neighbor and upper_neighbor in opponent_picks)
+        self._opp_rank_count[rank] += 1
+        self._opp_suit_count[card[-1]] += 1
+        rank_picks = self._opp_rank_count[rank]
+        if rank_picks == 2:
+            self._set_clues += 2
+        elif rank_picks > 2:
+            self._set_clues += 1
+        
+        open_picks[card] += 1
     
-    def _is_set_related(self, card: str, opponent_picks: List[str]) -> bool:
-        """Check if this pick suggests set building."""
-        rank = card[:-1]
-        same_rank_picks = sum(1 for c in opponent_picks if c[:-1] == rank)
-        return same_rank_picks >= 2
+    def _is_sequence_related(self, card: str, pick_mask: int) -> bool:
+        """Check if this pick suggests sequence building."""
+        # Check if neighbor cards were also picked
+        return bool(pick_mask & ADJACENT_BITS[card])
     
-    def _does_card_complete_group(self, hand: List[str], card: str, joker: str) -> bool:
+    def _does_card_complete_group(self, card: str, ctx: _EvalContext) -> bool:
         """Check if this card completes a sequence or set in our hand."""
-        # Check for sequences
-        suit = card[-1]
-        rank = card[:-1]
-        rank_idx = RANKS.index(rank)
+        hand_set = ctx.hand_set
         
         # Check for sequence completion
-        lower_neighbor = f"{RANKS[rank_idx-1]}{suit}" if rank_idx > 0 else None
-        upper_neighbor = f"{RANKS[rank_idx+1]}{suit}" if rank_idx < len(RANKS)-1 else None
+        lower_two, lower_neighbor, upper_neighbor, upper_two = NEIGHBORS[card]
         
         # Case 1: We have X and Y, this is Z to complete X Y Z
-        if lower_neighbor and f"{RANKS[rank_idx-2]}{suit}" in hand and lower_neighbor in hand:
+        if lower_two in hand_set and lower_neighbor in hand_set:
             return True
         
         # Case 2: We have Y and Z, this is X to complete X Y Z
-        if upper_neighbor and f"{RANKS[rank_idx+2]}{suit}" in hand and upper_neighbor in hand:
+        if upper_two in hand_set and upper_neighbor in hand_set:
             return True
         
         # Case 3: We have X and Z, this is Y to complete X Y Z
-        if lower_neighbor and upper_neighbor and lower_neighbor in hand and upper_neighbor in hand:
+        if lower_neighbor in hand_set and upper_neighbor in hand_set:
             return True
         
         # Check for set completion
-        same_rank_cards = [c for c in hand if c[:-1] == rank]
-        if len(same_rank_cards) >= 2:  # Would make a set of 3+
+        if ctx.rank_counts[CARD_INFO[card][0]] >= 2:  # Would make a set of 3+
             return True
         
         return False
+
+@lru_cache(maxsize=4096)
+def _cached_eval(hand: Tuple[str, ...], joker: str) -> float:
+    """Score a canonical hand for RummyAI.evaluate_hand_strength."""
+    # Count pure sequences (without joker) and potential sequences
+    # (with or without joker) together
+    pure_seq_count, potential_seq_count = RummyAI._seq_analysis(hand_to_mask(hand))
+    
+    # Count sets
+    set_count = RummyAI._count_sets(hand, joker)
+    
+    # Calculate score (weights can be adjusted)
+    score = (pure_seq_count * 0.4) + (potential_seq_count * 0.3) + (set_count * 0.3)
+    return min(score, 1.0)
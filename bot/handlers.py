@@ -6,7 +6,12 @@ from telegram.ext import (
     MessageHandler,
     filters
 )
-from typing import Dict
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+from collections import Counter
+from weakref import WeakValueDictionary
+import asyncio
+import logging
 import re
 import random
 from .game_logic import RummyAI
@@ -18,7 +23,7 @@ from .keyboards import (
 from .utils import (
     parse_cards,
     validate_cards,
-    validate_card,  # Explicitly imported
+    VALID_CARDS,
     cards_to_str,
     sort_cards
 )
@@ -33,72 +38,230 @@ from .constants import (
     GAME_ACTIVE,
 )
 
+logger = logging.getLogger(__name__)
+
 class GameState:
+    __slots__ = (
+        "_hand",
+        "_joker",
+        "discard_pile",
+        "opponent_picks",
+        "opponent_discards",
+        "open_card",
+        "picked_card",
+        "trap_activated",
+        "suggested_discard",
+        "ai",
+        "_sorted_valid",
+        "_sorted_cache",
+        "_hand_str",
+    )
+    
     def __init__(self):
         self.reset()
     
     def reset(self):
-        self.hand = []
-        self.joker = None
+        self._hand = Counter()  # card: copies held, so lookups and removal are O(1)
+        self._joker = None
         self.discard_pile = []
         self.opponent_picks = []
         self.opponent_discards = []
         self.open_card = None
         self.picked_card = None
         self.trap_activated = False
+        self.suggested_discard = None
+        # Each game gets its own AI so opponent tracking never leaks between users
+        self.ai = RummyAI()
+        # Display cache for the sorted hand, cleared by every hand/joker setter
+        self._sorted_valid = False
+        self._sorted_cache = []
+        self._hand_str = ""
+    
+    def sorted_hand(self) -> List[str]:
+        """Return the hand sorted for display, re-sorting only when it changed."""
+        if not self._sorted_valid:
+            self._sorted_cache = sort_cards(list(self._hand.elements()), self._joker)
+            self._hand_str = cards_to_str(self._sorted_cache)
+            self._sorted_valid = True
+        return self._sorted_cache
+    
+    @property
+    def hand(self) -> Mapping[str, int]:
+        """Read-only view of the hand; change it through the setters below."""
+        return MappingProxyType(self._hand)
+    
+    @property
+    def joker(self) -> Optional[str]:
+        """The joker card, or None before it is set; change it with set_joker."""
+        return self._joker
+    
+    def hand_display(self) -> str:
+        """Return the sorted hand as a display string."""
+        self.sorted_hand()
+        return self._hand_str
+    
+    def set_joker(self, joker: str):
+        """Set the joker and invalidate the display cache."""
+        self._joker = joker
+        self._sorted_valid = False
+    
+    def set_hand(self, cards: List[str]):
+        """Replace the hand and invalidate the display cache."""
+        self._hand = Counter(cards)
+        self._sorted_valid = False
+    
+    def add_card(self, card: str):
+        """Add a card to the hand and invalidate the display cache."""
+        self._hand[card] += 1
+        self._sorted_valid = False
+    
+    def remove_card(self, card: str):
+        """Remove one copy of a card from the hand and invalidate the display cache."""
+        if self._hand[card] <= 0:
+            raise ValueError(f"{card} is not in the hand")
+        self._hand[card] -= 1
+        if not self._hand[card]:
+            del self._hand[card]
+        self._sorted_valid = False
+
+# Each user's games live in context.user_data keyed by chat id, so a user
+# playing in two chats has two independent games, as with ConversationHandler.
+# PTB hands user_data to every update and persists it across restarts.
+# A game's GameState is stored under this key
+STATE_KEY = "state"
+# A game's current conversation step (one of the WAITING_FOR_* states)
+STEP_KEY = "step"
+
+# Reply text templates, rendered with str.format_map
+JOKER_SUGGESTION_TEMPLATE = (
+    "Based on your hand, I suggest you: {suggestion}\n\n"
+    "Would you like to Play or Drop?"
+)
+
+# Plain-text messages; every conversation step is routed from this one filter.
+# Edits are ignored: they carry update.edited_message, not update.message
+TEXT_NC = filters.UpdateType.MESSAGE & filters.TEXT & ~filters.COMMAND
+PICK_RE = re.compile(r"^(Open Deck|Closed Deck)$")
 
 class RummyBotHandlers:
+    # Conversation step -> name of the handler method for text in that step.
+    # GAME_ACTIVE is special-cased in _route for pick-source replies.
+    _STEP_HANDLERS = {
+        WAITING_FOR_HAND: "receive_hand",
+        WAITING_FOR_JOKER: "receive_joker",
+        SHOWING_SUGGESTION: "handle_play_or_drop",
+        WAITING_FOR_DISCARD_PILE: "receive_discard_pile",
+        WAITING_FOR_OPPONENT_PICKS: "receive_opponent_picks",
+        WAITING_FOR_OPPONENT_DISCARDS: "receive_opponent_discards",
+        WAITING_FOR_OPEN_CARD: "receive_open_card",
+        GAME_ACTIVE: "handle_discard",
+    }
+    
     def __init__(self):
-        self.ai = RummyAI()
-        self.game_state = GameState()
-        self.user_sessions = {}  # user_id: GameState
+        # Step -> bound handler, filled in the first time each step is routed
+        self._routes: Dict[int, Callable] = {}
+        # (user id, chat id) -> lock serialising that game's updates, which
+        # run concurrently otherwise; entries vanish once no update holds them
+        self._locks = WeakValueDictionary()
+    
+    def _step_handler(self, step: int) -> Callable:
+        """Return the bound handler for a step, looking it up only once."""
+        handler = self._routes.get(step)
+        if handler is None:
+            handler = self._routes[step] = getattr(self, self._STEP_HANDLERS[step])
+        return handler
     
     async def receive_joker(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Receive and validate the joker card."""
-        user_id = update.message.from_user.id
         joker_text = update.message.text.strip().upper()
         
-        try:
-            if not validate_card(joker_text):  # Now using the imported function
-                await update.message.reply_text(
-                    "Invalid joker card. Examples: '7D' (7♦), 'QS' (Q♠), '10H' (10♥)\n"
-                    "Please try again:"
-                )
-                return WAITING_FOR_JOKER
-            
-            self.user_sessions[user_id].joker = joker_text
-            hand = self.user_sessions[user_id].hand
-            suggestion = self.ai.suggest_initial_action(hand, joker_text)
-            
+        if joker_text not in VALID_CARDS:
             await update.message.reply_text(
-                f"Based on your hand, I suggest you: {suggestion}\n\n"
-                "Would you like to Play or Drop?",
-                reply_markup=get_play_or_drop_keyboard()
+                "Invalid joker card. Examples: '7D' (7♦), 'QS' (Q♠), '10H' (10♥)\n"
+                "Please try again:"
             )
-            
-            return SHOWING_SUGGESTION
-        except Exception as e:
-            await update.message.reply_text(f"Error processing joker: {e}. Please try again.")
             return WAITING_FOR_JOKER
+        
+        state = self._game(update, context).get(STATE_KEY)
+        if state is None:
+            await update.message.reply_text("No game in progress. Send /start to begin a new one.")
+            return ConversationHandler.END
+        
+        state.set_joker(joker_text)
+        try:
+            # Run the AI off the event loop so other users' updates keep flowing
+            suggestion = await asyncio.to_thread(
+                state.ai.suggest_initial_action, state.sorted_hand(), joker_text
+            )
+        except Exception:
+            logger.exception("Failed to compute initial suggestion")
+            await update.message.reply_text("Error processing joker. Please try again.")
+            return WAITING_FOR_JOKER
+        
+        await update.message.reply_text(
+            JOKER_SUGGESTION_TEMPLATE.format_map({"suggestion": suggestion}),
+            reply_markup=get_play_or_drop_keyboard()
+        )
+        
+        return SHOWING_SUGGESTION
 
     # ... [rest of your existing handler methods] ...
 
-    def get_conversation_handler(self):
-        """Return the configured conversation handler for the bot."""
-        return ConversationHandler(
-            entry_points=[CommandHandler("start", self.start)],
-            states={
-                WAITING_FOR_HAND: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_hand)],
-                WAITING_FOR_JOKER: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_joker)],
-                SHOWING_SUGGESTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_play_or_drop)],
-                WAITING_FOR_DISCARD_PILE: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_discard_pile)],
-                WAITING_FOR_OPPONENT_PICKS: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_opponent_picks)],
-                WAITING_FOR_OPPONENT_DISCARDS: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_opponent_discards)],
-                WAITING_FOR_OPEN_CARD: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.receive_open_card)],
-                GAME_ACTIVE: [
-                    MessageHandler(filters.Regex("^(Open Deck|Closed Deck)$"), self.handle_pick_source),
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_discard)
-                ],
-            },
-            fallbacks=[CommandHandler("cancel", self.cancel)],
-        )
+    @staticmethod
+    def _game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+        """Return the user's game for the current chat, creating it if needed."""
+        return context.user_data.setdefault(update.effective_chat.id, {})
+    
+    def _game_lock(self, update: Update) -> asyncio.Lock:
+        """Return the lock for the user's game in the current chat."""
+        key = (update.effective_user.id, update.effective_chat.id)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+    
+    async def _run_step(self, handler, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """
+        Run a step handler and store the step it returns in this chat's game.
+        Ending the conversation drops the game, state and step together.
+        """
+        next_step = await handler(update, context)
+        if next_step == ConversationHandler.END:
+            # Drop the finished game so persistence doesn't keep it forever
+            context.user_data.pop(update.effective_chat.id, None)
+        elif next_step is not None:
+            self._game(update, context)[STEP_KEY] = next_step
+    
+    async def _route(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Dispatch a text message to the handler for the game's current step."""
+        # Read the step under the lock too, so a second message waits for the
+        # first one's step change instead of racing it
+        async with self._game_lock(update):
+            game = context.user_data.get(update.effective_chat.id)
+            step = game.get(STEP_KEY) if game else None
+            if step is None:
+                return  # No game in progress; /start begins one
+            
+            if step == GAME_ACTIVE and PICK_RE.match(update.message.text):
+                handler = self.handle_pick_source
+            else:
+                handler = self._step_handler(step)
+            await self._run_step(handler, update, context)
+    
+    async def _start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start and record the first conversation step."""
+        async with self._game_lock(update):
+            await self._run_step(self.start, update, context)
+    
+    async def _cancel_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /cancel and clear the conversation step."""
+        async with self._game_lock(update):
+            await self._run_step(self.cancel, update, context)
+    
+    def get_handlers(self):
+        """Return the bot's handlers: /start, /cancel and one routed text handler."""
+        return [
+            CommandHandler("start", self._start_command, filters.UpdateType.MESSAGE),
+            CommandHandler("cancel", self._cancel_command, filters.UpdateType.MESSAGE),
+            MessageHandler(TEXT_NC, self._route),
+        ]
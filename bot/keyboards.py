@@ -1,6 +1,10 @@
+from functools import lru_cache
 from telegram import ReplyKeyboardMarkup
 from .constants import PLAY_OR_DROP, PICK_SOURCE
 
+# Keyboards are immutable, so each layout is built once and shared
+
+@lru_cache(maxsize=1)
 def get_play_or_drop_keyboard():
     return ReplyKeyboardMarkup(
         [[option] for option in PLAY_OR_DROP],
@@ -8,6 +12,7 @@ def get_play_or_drop_keyboard():
         resize_keyboard=True
     )
 
+@lru_cache(maxsize=1)
 def get_pick_source_keyboard():
     return ReplyKeyboardMarkup(
         [[option] for option in PICK_SOURCE],
@@ -17,6 +22,10 @@ def get_pick_source_keyboard():
 
 def get_discard_keyboard(cards: list):
     """Create a keyboard with the user's cards for discard selection."""
+    return _discard_keyboard(tuple(cards))
+
+@lru_cache(maxsize=64)
+def _discard_keyboard(cards: tuple):
     # Split cards into rows of 4 for better display
     rows = [cards[i:i+4] for i in range(0, len(cards), 4)]
     return ReplyKeyboardMarkup(
@@ -2,19 +2,33 @@ from typing import List, Dict, Tuple, Optional
 from collections import defaultdict
 from .constants import SUITS, RANKS
 
+# Every valid card string; validation is a single hashed lookup
+VALID_CARDS = frozenset(f"{rank}{suit}" for rank in RANKS for suit in SUITS)
+
+# Rank/suit -> position, so sort keys avoid list.index scans
+RANK_VALUE = {rank: idx for idx, rank in enumerate(RANKS)}
+SUIT_VALUE = {suit: idx for idx, suit in enumerate(SUITS)}
+
 def validate_card(card: str) -> bool:
     """Check if a single card string is valid."""
-    if len(card) < 2:
-        return False
-    
-    # Extract rank and suit
-    rank = card[:-1]
-    suit = card[-1]
-    
-    return rank in RANKS and suit in SUITS
+    return card in VALID_CARDS
 
 def validate_cards(cards: List[str]) -> bool:
     """Validate a list of cards."""
-    return all(validate_card(card) for card in cards)
+    return VALID_CARDS.issuperset(cards)
+
+def parse_cards(card_str: str) -> List[str]:
+    """Split a space-separated card string into upper-case card tokens."""
+    return card_str.upper().split()
+
+def calculate_card_value(card: str, joker: Optional[str] = None) -> Tuple[bool, int, int]:
+    """Sort key for a card: the joker first, then by rank, then by suit."""
+    return (card == joker, RANK_VALUE.get(card[:-1], -1), SUIT_VALUE.get(card[-1], -1))
+
+def sort_cards(cards: List[str], joker: Optional[str] = None) -> List[str]:
+    """Sort cards for display, joker first and then highest rank first."""
+    return sorted(cards, key=lambda card: calculate_card_value(card, joker), reverse=True)
 
-# ... [rest of your existing utils functions] ...
+def cards_to_str(cards: List[str]) -> str:
+    """Join cards into a single space-separated string."""
+    return " ".join(cards)
@@ -1,5 +1,6 @@
 from telegram import Update
-from telegram.ext import Application, CommandHandler
+from telegram.ext import Application, CommandHandler, PicklePersistence
+from telegram.request import HTTPXRequest
 import logging
 from bot.handlers import RummyBotHandlers
 from config import BOT_TOKEN
@@ -11,16 +12,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+try:
+    import uvloop
+except ImportError:  # not available on Windows; fall back to the default loop
+    uvloop = None
+
 def main():
     """Start the bot."""
-    application = Application.builder().token(BOT_TOKEN).build()
+    if uvloop is not None:
+        uvloop.install()
+    
+    persistence = PicklePersistence(filepath="sessions.pkl")
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .request(HTTPXRequest(http_version="2", connection_pool_size=256, pool_timeout=10))
+        .get_updates_request(HTTPXRequest(http_version="2"))
+        .persistence(persistence)
+        .concurrent_updates(True)
+        .build()
+    )
     
     rummy_handlers = RummyBotHandlers()
-    conv_handler = rummy_handlers.get_conversation_handler()
     
-    application.add_handler(conv_handler)
+    application.add_handlers(rummy_handlers.get_handlers())
     application.add_handler(CommandHandler("help", rummy_handlers.help_command))
-    application.add_handler(CommandHandler("start", rummy_handlers.start))
     
     application.run_polling(allowed_updates=Update.ALL_TYPES)
 